@@ -1,20 +1,43 @@
 #!/usr/bin/env python3
 
-import requests
+import httpx
 import sys
 import re
 import os
 import time
 import random
 import argparse
+import html
+import asyncio
+import json
+import tempfile
 from urllib.parse import urlparse, urljoin
 import xml.etree.ElementTree as ET
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import html2text
 from datetime import datetime, date
+try:
+    from contextlib import aclosing
+except ImportError:  # Python < 3.10
+    from contextlib import asynccontextmanager
+    @asynccontextmanager
+    async def aclosing(agen):
+        try: yield agen
+        finally: await agen.aclose()
+try:
+    from lxml import etree  # C-backed parsers, much faster than html.parser / ElementTree
+    HTML_PARSER = 'lxml'
+except ImportError:
+    etree = None
+    HTML_PARSER = 'html.parser'
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
 
 # --- Default Configuration (can be overridden by args) ---
 OUTPUT_DIR = "markdown_articles"
+CACHE_FILENAME = ".cache.json"
 USER_AGENT_LIST = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -24,6 +47,12 @@ USER_AGENT_LIST = [
 ]
 MIN_DELAY = 2.0
 MAX_DELAY = 5.0
+MAX_WORKERS = 8
+POOL_SIZE = 20
+STREAM_CHUNK_SIZE = 65536
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 1.0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
 CONNECTIVITY_CHECK_URL = "https://wp.com"
 SITEMAP_SUFFIXES = [
     "/sitemap_index.xml", "/sitemap.xml", "/post-sitemap.xml",
@@ -31,30 +60,55 @@ SITEMAP_SUFFIXES = [
 ]
 # --- End Configuration ---
 
+# Only these top-level elements are kept when parsing an article page; everything else is discarded during parse.
+# The class regex matches whole class tokens, so multi-class values like "entry-date published" are kept too.
+ARTICLE_STRAINER = SoupStrainer(['h1', 'time', 'div'], class_=re.compile(r'(?:^|\s)(?:entry-title|entry-date|entry-content)(?:\s|$)'))
+CONTENT_STRAINER = SoupStrainer('div', class_=re.compile(r'(?:^|\s)entry-content(?:\s|$)'))
+
+# --- Precompiled Patterns ---
+_FNAME_STRIP = re.compile(r'[^\w\-\s]')
+_FNAME_WS = re.compile(r'\s+')
+_FNAME_DASH = re.compile(r'-+')
+_DATE_IN_URL = re.compile(r'/(\d{4})/(\d{2})/(\d{2})/')
+_DATE_STR = re.compile(r'\d{4}-\d{2}-\d{2}')
+ARTICLE_URL_PATTERN = re.compile(r"/\d{4}/\d{2}(?:/\d{2})?/")
+# Title/date fast path on raw HTML, before any tree is built.
+# Comments, scripts and templates are consumed whole, so markup inside them never matches the named group.
+_SKIPPED_BLOCKS = r'<!--.*?-->|<script\b.*?</script\s*>|<template\b.*?</template\s*>|'
+_TITLE_RE = re.compile(_SKIPPED_BLOCKS + r'<h1\b[^>]*(?<![\w-])class=["\'][^"\']*?(?<![\w-])entry-title(?![\w-])[^>]*>(?P<title>.*?)</h1>', re.DOTALL | re.IGNORECASE)
+_TIME_TAG_RE = re.compile(_SKIPPED_BLOCKS + r'(?P<time><time\b[^>]*(?<![\w-])class=["\'][^"\']*?(?<![\w-])entry-date(?![\w-])[^>]*>)', re.DOTALL | re.IGNORECASE)
+_DATETIME_ATTR_RE = re.compile(r'(?<![\w-])datetime=["\']([^"\']+)', re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+XML_PARSE_ERRORS = (ET.ParseError, etree.ParseError) if etree is not None else (ET.ParseError,)
+
 # --- Standard Browser Headers ---
 BASE_HEADERS = {
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
     'Accept-Language': 'en-US,en;q=0.9', 'Accept-Encoding': 'gzip, deflate, br',
-    'Connection': 'keep-alive', 'Upgrade-Insecure-Requests': '1',
-}
+    'Upgrade-Insecure-Requests': '1',
+}  # No 'Connection' header: it is forbidden over HTTP/2 and httpx keeps connections alive itself.
+
+# --- Shared State (article tasks) ---
+_next_request_at = 0.0
 
 # --- Helper Functions ---
 
-def check_connectivity(url_to_check, disable_ssl_verify):
+async def check_connectivity(url_to_check, disable_ssl_verify):
     """Checks if a given URL is reachable."""
     print(f"[*] Checking connectivity to {url_to_check}...")
     verify_ssl = not disable_ssl_verify
     try:
-        response = requests.head(url_to_check, timeout=15, verify=verify_ssl)
+        async with httpx.AsyncClient(timeout=15, verify=verify_ssl, follow_redirects=True) as client:
+            response = await client.head(url_to_check)
         response.raise_for_status()
         print(f"[+] Connectivity check successful ({response.status_code}).")
         return True
-    except requests.exceptions.SSLError as e:
-         print(f"[!] SSL Error during connectivity check: {e}", file=sys.stderr)
-         if not verify_ssl: pass
-         else: print("[!] Consider using --disable-ssl if this is expected.")
+    except httpx.ConnectError as e:
+         print(f"[!] Connection Error during connectivity check: {e}", file=sys.stderr)
+         if verify_ssl and 'ssl' in str(e).lower(): print("[!] Consider using --disable-ssl if this is expected.")
          return False
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"[!] Connectivity check failed: {e}", file=sys.stderr)
         return False
     except Exception as e:
@@ -62,24 +116,36 @@ def check_connectivity(url_to_check, disable_ssl_verify):
         return False
 
 def create_session(disable_ssl_verify):
-    """Creates a requests Session object."""
-    session = requests.Session()
-    session.headers.update(BASE_HEADERS)
+    """Creates an HTTP/2-capable httpx AsyncClient shared by all article tasks."""
     chosen_user_agent = random.choice(USER_AGENT_LIST)
-    session.headers.update({'User-Agent': chosen_user_agent})
+    limits = httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE)
+    transport = httpx.AsyncHTTPTransport(http2=True, verify=not disable_ssl_verify, limits=limits, retries=MAX_RETRIES)
+    session = httpx.AsyncClient(transport=transport, headers={**BASE_HEADERS, 'User-Agent': chosen_user_agent}, timeout=45.0, follow_redirects=True)
     print(f"[*] Session created with User-Agent: {chosen_user_agent}")
-    session.verify = not disable_ssl_verify
-    if not session.verify:
-        import urllib3
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
     return session
 
-def fetch_url(session, url, is_xml=False):
+def retry_delay(response, attempt):
+    """Returns seconds to wait before retrying a 429/5xx response (Retry-After if numeric, else exponential backoff), or None if it should not be retried."""
+    if response.status_code not in RETRY_STATUSES or attempt >= MAX_RETRIES: return None
+    retry_after = response.headers.get('Retry-After', '')
+    if retry_after.isdigit(): return float(retry_after)
+    return BACKOFF_FACTOR * (2 ** attempt)
+
+async def get_with_retries(session, url, **kwargs):
+    """GETs a URL, retrying transient 429/5xx answers with backoff (connection failures are retried by the transport)."""
+    for attempt in range(MAX_RETRIES + 1):
+        response = await session.get(url, **kwargs)
+        delay = retry_delay(response, attempt)
+        if delay is None: return response
+        print(f"[!] HTTP {response.status_code} for {url}, retrying in {delay:.1f}s ({attempt + 1}/{MAX_RETRIES})", file=sys.stderr)
+        await asyncio.sleep(delay)
+
+async def fetch_url(session, url, is_xml=False):
     """Fetches content using the provided session."""
     print(f"[*] Fetching: {url}")
     if url.startswith("data:"): return None
     try:
-        response = session.get(url, timeout=45)
+        response = await get_with_retries(session, url)
         response.raise_for_status()
         if is_xml:
             content_type = response.headers.get('Content-Type', '').lower()
@@ -87,104 +153,159 @@ def fetch_url(session, url, is_xml=False):
                 print(f"[!] Warning: Expected XML, got {content_type}", file=sys.stderr)
             return response.content
         return response.text
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"[!] Request Error fetching {url}: {e}", file=sys.stderr)
         return None
     except Exception as e:
         print(f"[!] Unexpected error fetching {url}: {e}", file=sys.stderr)
         return None
 
-def parse_sitemap_index(xml_content):
-    """Parses an XML sitemap index file."""
-    sitemap_urls = []
-    if not xml_content: return sitemap_urls
-    print("[*] Parsing sitemap index XML...")
+async def fetch_article(session, url, cache_entry=None):
+    """
+    Fetches article HTML, sending If-None-Match / If-Modified-Since from the cache entry when available.
+    Returns (html, validators, not_modified); html is None on failure or when the server answers 304.
+    """
+    print(f"[*] Fetching: {url}")
+    headers = {}
+    if cache_entry:
+        if cache_entry.get('etag'): headers['If-None-Match'] = cache_entry['etag']
+        if cache_entry.get('last_modified'): headers['If-Modified-Since'] = cache_entry['last_modified']
     try:
-        root = ET.fromstring(xml_content)
-        ns_uri = root.tag.split('}')[0][1:] if '}' in root.tag else 'http://www.sitemaps.org/schemas/sitemap/0.9'
-        ns = {'ns': ns_uri}
-        for sm in root.findall('ns:sitemap', ns):
-            loc = sm.find('ns:loc', ns)
-            if loc is not None and loc.text: sitemap_urls.append(loc.text.strip())
-        print(f"[*] Found {len(sitemap_urls)} URLs in sitemap index.")
-    except Exception as e: print(f"[!] Error parsing sitemap index: {e}", file=sys.stderr)
-    return sitemap_urls
+        response = await get_with_retries(session, url, headers=headers)
+        if response.status_code == 304: return None, {}, True
+        response.raise_for_status()
+        validators = {'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified')}
+        return response.text, validators, False
+    except httpx.HTTPError as e:
+        print(f"[!] Request Error fetching {url}: {e}", file=sys.stderr)
+    except Exception as e:
+        print(f"[!] Unexpected error fetching {url}: {e}", file=sys.stderr)
+    return None, {}, False
 
-def parse_url_sitemap(xml_content):
-    """Parses a URL sitemap file."""
-    url_data = []
-    if not xml_content: return None # Indicate failure clearly if no content
-    print("[*] Parsing URL sitemap XML...")
+async def stream_url(session, url):
+    """Yields the (decoded) response body of an XML URL in chunks as they arrive. Request errors are printed and re-raised."""
+    print(f"[*] Streaming: {url}")
+    try:
+        for attempt in range(MAX_RETRIES + 1):
+            async with session.stream('GET', url) as response:
+                delay = retry_delay(response, attempt)
+                if delay is None:
+                    response.raise_for_status()
+                    content_type = response.headers.get('Content-Type', '').lower()
+                    if 'xml' not in content_type:
+                        print(f"[!] Warning: Expected XML, got {content_type}", file=sys.stderr)
+                    async for chunk in response.aiter_bytes(chunk_size=STREAM_CHUNK_SIZE): yield chunk
+                    return
+            print(f"[!] HTTP {response.status_code} for {url}, retrying in {delay:.1f}s ({attempt + 1}/{MAX_RETRIES})", file=sys.stderr)
+            await asyncio.sleep(delay)
+    except httpx.HTTPError as e:
+        print(f"[!] Request Error fetching {url}: {e}", file=sys.stderr)
+        raise
+
+def _read_sitemap_entry(elem):
+    """Returns (loc, lastmod) from a <url>/<sitemap> element, matching children by local name."""
+    loc, lastmod = None, None
+    for child in elem:
+        if not isinstance(child.tag, str): continue # lxml comments / processing instructions
+        child_name = child.tag.rsplit('}', 1)[-1]
+        if child_name == 'loc' and child.text: loc = child.text.strip()
+        elif child_name == 'lastmod' and child.text: lastmod = child.text.strip()
+    return loc, lastmod
+
+async def iter_sitemap_entries(xml_source):
+    """Yields (entry_name, loc, lastmod) for each <url>/<sitemap> entry of sitemap bytes, str or stream_url chunks."""
+    if isinstance(xml_source, str): xml_source = xml_source.encode('utf-8')
+    # Pull parser fed chunk by chunk, entries cleared once read so memory stays bounded; lxml filters to the entry tags in any namespace
+    if etree is not None: parser = etree.XMLPullParser(events=('end',), tag=('{*}url', '{*}sitemap'))
+    else: parser = ET.XMLPullParser(events=('start', 'end'))
+    root = None
+
+    def drain():
+        nonlocal root
+        for event, elem in parser.read_events():
+            if etree is not None:
+                yield (elem.tag.rsplit('}', 1)[-1], *_read_sitemap_entry(elem))
+                elem.clear()
+                while elem.getprevious() is not None: del elem.getparent()[0]
+                continue
+            if root is None: root = elem; continue
+            entry_name = elem.tag.rsplit('}', 1)[-1]
+            if event != 'end' or entry_name not in ('url', 'sitemap'): continue
+            yield (entry_name, *_read_sitemap_entry(elem))
+            root.clear()
+
+    if isinstance(xml_source, bytes):
+        parser.feed(xml_source)
+    else:
+        async for chunk in xml_source:
+            parser.feed(chunk)
+            for entry in drain(): yield entry
+    parser.close()
+    for entry in drain(): yield entry
+
+async def parse_sitemap(xml_source, collected):
+    """Parses a sitemap into `collected` (url -> lastmod); returns sub-sitemap URLs ([] for a URL sitemap), or None on failure."""
+    if not xml_source: return None # Indicate failure clearly if no content
+    print("[*] Parsing sitemap XML...")
+    sitemap_urls, url_count = [], 0
     try:
-        root = ET.fromstring(xml_content)
-        namespace_uri = ''
-        if '}' in root.tag: namespace_uri = root.tag.split('}')[0][1:]
-        if not namespace_uri: namespace_uri = 'http://www.sitemaps.org/schemas/sitemap/0.9'
-        namespace = {'ns': namespace_uri}
-
-        for url_element in root.findall('ns:url', namespace):
-            loc_element = url_element.find('ns:loc', namespace)
-            lastmod_element = url_element.find('ns:lastmod', namespace)
-            url = loc_element.text.strip() if loc_element is not None and loc_element.text else None
-            lastmod = lastmod_element.text.strip() if lastmod_element is not None and lastmod_element.text else None
-            if url: url_data.append((url, lastmod))
-
-        print(f"[*] Found {len(url_data)} URLs in sitemap.")
-    except ET.ParseError as e:
-        print(f"[!] XML Parse Error in URL sitemap: {e}", file=sys.stderr)
-        if xml_content:
-            snippet = xml_content[:500].decode('utf-8', errors='ignore') if isinstance(xml_content, bytes) else xml_content[:500]
+        async for entry_name, loc, lastmod in iter_sitemap_entries(xml_source):
+            if not loc: continue
+            if entry_name == 'url': collected[loc] = lastmod; url_count += 1
+            else: sitemap_urls.append(loc)
+        if sitemap_urls: print(f"[*] Found {len(sitemap_urls)} URLs in sitemap index.")
+        else: print(f"[*] Found {url_count} URLs in sitemap.")
+    except XML_PARSE_ERRORS as e:
+        print(f"[!] XML Parse Error in sitemap: {e}", file=sys.stderr)
+        if isinstance(xml_source, (bytes, str)):
+            snippet = xml_source[:500].decode('utf-8', errors='ignore') if isinstance(xml_source, bytes) else xml_source[:500]
             print(f"    Nearby content: {snippet}...", file=sys.stderr)
         return None # Indicate failure clearly
+    except httpx.HTTPError:
+        return None # Already reported by stream_url
     except Exception as e:
-        print(f"[!] Unexpected Error parsing URL sitemap: {e}", file=sys.stderr)
+        print(f"[!] Unexpected Error parsing sitemap: {e}", file=sys.stderr)
         return None # Indicate failure clearly
-    return url_data
+    return sitemap_urls
 
-def filter_articles_by_date(url_data, since_date_str, exclude_no_date=True):
+def filter_article_urls(url_data, target_domain, since_date_str, exclude_no_date=True):
     """
-    Filters the list of (URL, lastmod) tuples based on the since_date.
-    By default, excludes articles without a valid parseable date when filtering.
+    Filters (URL, lastmod) tuples in a single pass: target domain, article URL pattern, then since_date.
+    By default, excludes articles without a valid parseable date when date filtering.
+    Returns the list of URLs to process.
     """
-    if not since_date_str:
-        print("[*] No --since-date provided, skipping date filtering.")
-        return url_data
-
-    print(f"[*] Filtering articles published on or after {since_date_str}...")
-    filtered_data = []
-    try:
-        since_dt = datetime.strptime(since_date_str, '%Y-%m-%d').date()
-    except ValueError:
-        print(f"[!] Invalid --since-date format '{since_date_str}'. Skipping date filtering.", file=sys.stderr)
-        return url_data
-
-    kept_count = 0
+    since_dt, since_key = None, None
+    if since_date_str:
+        try: since_dt = datetime.strptime(since_date_str, '%Y-%m-%d').date(); since_key = since_dt.isoformat() # Zero-padded, comparable as a string
+        except ValueError: print(f"[!] Invalid --since-date format '{since_date_str}'. Skipping date filtering.", file=sys.stderr)
+    else: print("[*] No --since-date provided, skipping date filtering.")
+
+    print(f"[*] Filtering {len(url_data)} URLs for domain '{target_domain}', article pattern" + (f" & date >= {since_date_str}..." if since_dt else "..."))
+    domain_prefixes = (f"https://{target_domain}/", f"http://{target_domain}/")  # Scheme-agnostic, like the old netloc comparison
+    kept_urls = []
+    skipped_pattern_count = 0
     skipped_by_date_count = 0
     skipped_no_date_count = 0
     error_count = 0
 
-    print(f"    Filtering {len(url_data)} total URLs...")
-
     for url, lastmod_str in url_data:
+        if not url.startswith(domain_prefixes) or not ARTICLE_URL_PATTERN.search(url):
+            skipped_pattern_count += 1
+            continue
+        if since_dt is None:
+            kept_urls.append(url)
+            continue
         if not lastmod_str:
-            if exclude_no_date:
-                # print(f"    [Filter Debug] Skipping (no lastmod date): {url}") # Verbose
-                skipped_no_date_count += 1
-            else:
-                # print(f"    [Filter Debug] Keeping (no lastmod date, exclude_no_date=False): {url}") # Verbose
-                filtered_data.append((url, None))
-                kept_count += 1
+            if exclude_no_date: skipped_no_date_count += 1
+            else: kept_urls.append(url)
+            continue
+        if _DATE_STR.match(lastmod_str): # ISO-8601 dates sort lexicographically, no datetime needed
+            if lastmod_str[:10] >= since_key: kept_urls.append(url)
+            else: skipped_by_date_count += 1
             continue
-
         try:
-            article_dt = datetime.fromisoformat(lastmod_str.replace('Z', '+00:00')).date()
-            comparison = article_dt >= since_dt
-            # print(f"    [Filter Debug] Compare: {url} | {article_dt} >= {since_dt} ? {comparison}") # Verbose
-            if comparison:
-                filtered_data.append((url, lastmod_str))
-                kept_count += 1
-            else:
-                skipped_by_date_count +=1
+            if datetime.fromisoformat(lastmod_str.replace('Z', '+00:00')).date() >= since_dt: kept_urls.append(url)
+            else: skipped_by_date_count += 1
         except ValueError:
             error_count += 1
             print(f"    [Filter Debug] Skipping (ValueError parsing lastmod '{lastmod_str}'): {url}")
@@ -192,68 +313,161 @@ def filter_articles_by_date(url_data, since_date_str, exclude_no_date=True):
             error_count += 1
             print(f"    [Filter Debug] Skipping (Error parsing lastmod '{lastmod_str}' - {e}): {url}")
 
-    print(f"[*] Date Filtering Results: Kept={kept_count}, Skipped(Date)={skipped_by_date_count}, Skipped(NoDate/Error)={skipped_no_date_count + error_count}")
-    return filtered_data
+    print(f"[*] Filtering Results: Kept={len(kept_urls)}, Skipped(Domain/Pattern)={skipped_pattern_count}, Skipped(Date)={skipped_by_date_count}, Skipped(NoDate/Error)={skipped_no_date_count + error_count}")
+    return kept_urls
+
+def _first_match(pattern, html_content, group):
+    """Returns the first `group` text matched by pattern outside comments, scripts and templates, or None."""
+    for match in pattern.finditer(html_content):
+        if match.group(group) is not None: return match.group(group)
+    return None
+
+def match_title_and_datetime(html_content):
+    """Regex fast path: returns (title, datetime attr) straight from raw article HTML; missing parts are None."""
+    title, dt_attr = None, None
+    title_html = _first_match(_TITLE_RE, html_content, 'title')
+    if title_html is not None: title = ''.join(html.unescape(text).strip() for text in _TAG_RE.split(title_html)) or None  # Same as get_text(strip=True)
+    time_tag = _first_match(_TIME_TAG_RE, html_content, 'time')
+    if time_tag:
+        dt_match = _DATETIME_ATTR_RE.search(time_tag)
+        if dt_match: dt_attr = html.unescape(dt_match.group(1))
+    return title, dt_attr
+
+def extract_article_parts(html_content):
+    """Extracts (title, datetime attr, content HTML string or bs4 Tag) from article HTML; missing parts are None."""
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html_content)
+        content_node = tree.css_first('div.entry-content')
+        if content_node is not None:
+            title_node, time_node = tree.css_first('h1.entry-title'), tree.css_first('time.entry-date')
+            title = title_node.text(strip=True) if title_node is not None else None
+            dt_attr = time_node.attributes.get('datetime') if time_node is not None else None
+            return title, dt_attr, content_node.html.replace('&nbsp;', '\xa0')  # Literal U+00A0 like bs4's str(), so html2text treats it the same
+    title, dt_attr = match_title_and_datetime(html_content)  # When both are found, only the content div needs parsing
+    soup = BeautifulSoup(html_content, HTML_PARSER, parse_only=CONTENT_STRAINER if title and dt_attr else ARTICLE_STRAINER)
+    if title is None:
+        title_tag = soup.find('h1', class_='entry-title')
+        title = title_tag.get_text(strip=True) if title_tag else None
+    if dt_attr is None:
+        time_tag = soup.find('time', class_='entry-date')
+        dt_attr = time_tag.get('datetime') if time_tag else None
+    return title, dt_attr, soup.find('div', class_='entry-content')
+
+def convert_to_markdown(content, base_url):
+    """Converts article content (HTML string or bs4 Tag) to Markdown with html2text, resolving relative links and images against base_url."""
+    h = html2text.HTML2Text(); h.ignore_links,h.ignore_images,h.body_width,h.unicode_snob,h.bypass_tables,h.baseurl = False,False,0,True,False,base_url
+    return h.handle(content if isinstance(content, str) else str(content))
 
 def parse_and_convert_article(html_content, base_url):
     """Parses article HTML, extracts metadata, converts to Markdown."""
     if not html_content: return None, None, None
-    soup = BeautifulSoup(html_content, 'html.parser')
     title, date_str, markdown = "Untitled Article", None, None
-    title_tag = soup.find('h1', class_='entry-title')
-    if title_tag: title = title_tag.get_text(strip=True)
+    title_text, dt_attr, content = extract_article_parts(html_content)
+    if title_text: title = title_text
     else: print(f"[!] Warn: No title for {base_url}")
-    time_tag = soup.find('time', class_='entry-date')
-    if time_tag and time_tag.has_attr('datetime'):
-        dt_attr = time_tag['datetime']
+    if dt_attr:
         try: date_str = datetime.fromisoformat(dt_attr.replace('Z', '+00:00')).strftime('%Y-%m-%d'); print(f"[*] Article Date: {date_str}")
         except Exception as e: print(f"[!] Warn: Bad date attr '{dt_attr}': {e}")
     else:
-        match = re.search(r'/(\d{4})/(\d{2})/(\d{2})/', base_url)
+        match = _DATE_IN_URL.search(base_url)
         if match: date_str = f"{match.group(1)}-{match.group(2)}-{match.group(3)}"; print(f"[*] Article Date (URL): {date_str}")
         else: print(f"[!] Warn: No date for {base_url}")
-    content_div = soup.find('div', class_='entry-content')
-    if not content_div: print(f"[!] No content for {base_url}", file=sys.stderr); return title, date_str, None
+    if content is None: print(f"[!] No content for {base_url}", file=sys.stderr); return title, date_str, None
     print("[*] Converting to Markdown...")
-    h = html2text.HTML2Text(); h.ignore_links,h.ignore_images,h.body_width,h.unicode_snob,h.bypass_tables,h.baseurl = False,False,0,True,False,base_url
-    try: markdown = h.handle(str(content_div))
+    try: markdown = convert_to_markdown(content, base_url)
     except Exception as e: print(f"[!] Convert error: {e}", file=sys.stderr); return title, date_str, None
     return title, date_str, markdown
 
 def clean_filename(title, date_str):
     """Cleans title, prepends date for filename."""
-    cl_title = re.sub(r'[^\w\-\s]', '', title); cl_title = re.sub(r'\s+', '-', cl_title).strip('-'); cl_title = re.sub(r'-+', '-', cl_title).lower()
+    cl_title = _FNAME_STRIP.sub('', title); cl_title = _FNAME_WS.sub('-', cl_title).strip('-'); cl_title = _FNAME_DASH.sub('-', cl_title).lower()
     max_len = 180
     if len(cl_title) > max_len:
         try: cl_title = cl_title[:max_len].rsplit('-', 1)[0]
         except IndexError: cl_title = cl_title[:max_len]
     if not cl_title: cl_title = "unnamed-article"
-    if date_str and re.match(r'\d{4}-\d{2}-\d{2}', date_str): return f"{date_str}-{cl_title}.md"
+    if date_str and _DATE_STR.match(date_str): return f"{date_str}-{cl_title}.md"
     else:
         if date_str: print(f"[!] Warn: Bad date '{date_str}', not prepending.")
         return f"{cl_title}.md"
 
 def save_markdown(filename, title, date_str, markdown_content, source_url):
-    """Saves Markdown content to file."""
-    try: os.makedirs(OUTPUT_DIR, exist_ok=True)
-    except OSError as e: print(f"[!] Cannot create dir {OUTPUT_DIR}: {e}", file=sys.stderr); return False
+    """Saves Markdown content to file (OUTPUT_DIR must already exist)."""
     filepath = os.path.join(OUTPUT_DIR, filename); print(f"[*] Saving to: {filepath}")
+    payload = f"**Date:** {date_str or 'N/A'}\n\n**Source URL:** <{source_url}>\n\n# {title}\n\n{markdown_content}".encode('utf-8')
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(f"**Date:** {date_str or 'N/A'}\n\n"); f.write(f"**Source URL:** <{source_url}>\n\n"); f.write(f"# {title}\n\n"); f.write(markdown_content)
+        # Raw fd write: no buffered file object per article (O_BINARY keeps Windows from translating newlines)
+        fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o666)
+        try:
+            view = memoryview(payload)
+            while view: view = view[os.write(fd, view):]
+        finally: os.close(fd)
         print(f"[+] Saved: {filepath}"); return True
     except Exception as e: print(f"[!] Save error: {e}", file=sys.stderr); return False
 
-def random_delay():
+def load_cache():
+    """Loads the download cache (url -> lastmod, file, HTTP validators) from OUTPUT_DIR, or returns an empty one."""
+    cache_path = os.path.join(OUTPUT_DIR, CACHE_FILENAME)
+    if not os.path.exists(cache_path): return {}
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f: cache = json.load(f)
+    except (OSError, ValueError) as e: print(f"[!] Warn: Ignoring unreadable cache {cache_path}: {e}", file=sys.stderr); return {}
+    if not isinstance(cache, dict): print(f"[!] Warn: Ignoring malformed cache {cache_path}", file=sys.stderr); return {}
+    entries = {url: entry for url, entry in cache.items() if isinstance(entry, dict) and isinstance(entry.get('file'), str) and entry['file']}  # Drops entries from other cache layouts
+    if len(entries) < len(cache): print(f"[!] Warn: Dropped {len(cache) - len(entries)} malformed cache entries.", file=sys.stderr)
+    print(f"[*] Loaded download cache with {len(entries)} entries.")
+    return entries
+
+def save_cache(cache):
+    """Writes the download cache atomically (temp file + rename) into OUTPUT_DIR."""
+    try:
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=OUTPUT_DIR, prefix=CACHE_FILENAME, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f: json.dump(cache, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, os.path.join(OUTPUT_DIR, CACHE_FILENAME))
+    except OSError as e: print(f"[!] Cache save error: {e}", file=sys.stderr)
+
+async def random_delay():
     """Pauses execution randomly."""
-    delay = random.uniform(MIN_DELAY, MAX_DELAY); print(f"[*] Waiting {delay:.2f}s..."); time.sleep(delay)
+    delay = random.uniform(MIN_DELAY, MAX_DELAY); print(f"[*] Waiting {delay:.2f}s..."); await asyncio.sleep(delay)
+
+async def paced_delay(workers):
+    """Sleeps until the next request slot shared by all article tasks."""
+    global _next_request_at
+    now = time.monotonic()
+    slot = max(now, _next_request_at)  # No await between read and update, so no lock is needed
+    # Slots are spaced by delay / workers, so each worker keeps the usual per-request delay
+    _next_request_at = slot + random.uniform(MIN_DELAY, MAX_DELAY) / workers
+    if slot > now: await asyncio.sleep(slot - now)
+
+async def process_article(session, semaphore, article_url, lastmod, cache, position, total, workers, use_cache=True):
+    """Fetches, converts and saves one article, updating its cache entry; returns 'saved', 'unchanged' or 'failed'."""
+    cache_entry = cache.get(article_url) if use_cache else None
+    if cache_entry and not os.path.isfile(os.path.join(OUTPUT_DIR, cache_entry['file'])): cache_entry = None
+    if cache_entry and lastmod and cache_entry.get('lastmod') == lastmod:
+        print(f"[*] Unchanged since last run (lastmod {lastmod}), skipping {position}/{total}: {article_url}"); return 'unchanged'
+    async with semaphore:  # At most `workers` fetches in flight; parsing and saving run in worker threads below
+        await paced_delay(workers)
+        print(f"[*] Processing {position}/{total}: {article_url}")
+        # Conditional GET only when the sitemap gives no lastmod to compare against
+        html_content, validators, not_modified = await fetch_article(session, article_url, None if lastmod else cache_entry)
+    if not_modified: print(f"[*] Not modified (304): {article_url}"); return 'unchanged'
+    if not html_content: return 'failed'
+    title, article_date_str, md_content = await asyncio.to_thread(parse_and_convert_article, html_content, article_url)
+    if not md_content: print(f"[!] Failed convert: {article_url}", file=sys.stderr); return 'failed'
+    filename = clean_filename(title, article_date_str)
+    if not await asyncio.to_thread(save_markdown, filename, title, article_date_str, md_content, article_url): return 'failed'
+    cache[article_url] = {'lastmod': lastmod, 'file': filename, **validators}
+    return 'saved'
 
 # --- Main Execution ---
-def main():
+async def main():
     parser = argparse.ArgumentParser(description="Download WordPress articles as Markdown.")
     parser.add_argument("--url", help="Base URL of the target site (e.g., https://thedfirreport.com). Required if --sitemap-file is relative or not provided.")
     parser.add_argument("--disable-ssl", action="store_true", help="Disable SSL certificate verification.")
     parser.add_argument("--since-date", help="Only download articles on or after this date (YYYY-MM-DD).")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help=f"Number of article downloads in flight at once (default: {MAX_WORKERS}).")
+    parser.add_argument("--no-cache", action="store_true", help=f"Ignore the download cache ({CACHE_FILENAME} in the output directory) and re-download every article.")
     parser.add_argument("--sitemap-file", help="URL or relative path (e.g., 'sitemap.xml') of the sitemap file. If relative, --url must be provided.")
 
     args = parser.parse_args()
@@ -275,6 +489,8 @@ def main():
     elif not base_url: sys.exit("[!] Error: Must provide --url or --sitemap-file.")
     if not target_domain: sys.exit("[!] Critical Error: Could not determine target domain.")
 
+    if args.workers < 1: sys.exit(f"[!] Error: --workers must be at least 1, got {args.workers}.")
+
     if args.since_date:
         try: datetime.strptime(args.since_date, '%Y-%m-%d')
         except ValueError: sys.exit(f"[!] Error: Invalid --since-date format: '{args.since_date}'.")
@@ -285,99 +501,83 @@ def main():
     if final_sitemap_url: print(f"[*] Sitemap URL: {final_sitemap_url}")
     else: print(f"[*] Using Auto-Discovery from: {base_url}")
     print(f"[*] Output Directory: {OUTPUT_DIR}")
-    print(f"[*] Delay: {MIN_DELAY:.1f}s - {MAX_DELAY:.1f}s")
+    print(f"[*] Delay: {MIN_DELAY:.1f}s - {MAX_DELAY:.1f}s per worker, Workers: {args.workers}")
     if args.since_date: print(f"[*] Filtering since: {args.since_date}")
     if args.disable_ssl: print("[!] SSL Verification: DISABLED")
 
-    if not check_connectivity(CONNECTIVITY_CHECK_URL, args.disable_ssl): sys.exit("[!] Connectivity check failed.")
-
-    session = create_session(args.disable_ssl)
+    if not await check_connectivity(CONNECTIVITY_CHECK_URL, args.disable_ssl): sys.exit("[!] Connectivity check failed.")
 
-    all_url_data = []
-    sitemaps_to_process = []
-    sitemap_found = False
+    async with create_session(args.disable_ssl) as session:
+        collected = {}
+        parsed_sitemaps = set()
+        sitemaps_to_process = []
+        sitemap_found = False
 
-    if final_sitemap_url:
-        print(f"[*] Using explicit sitemap URL: {final_sitemap_url}")
-        xml_content = fetch_url(session, final_sitemap_url, is_xml=True)
-        if xml_content:
-            temp_sitemap_urls = parse_sitemap_index(xml_content)
-            if temp_sitemap_urls:
+        if final_sitemap_url:
+            print(f"[*] Using explicit sitemap URL: {final_sitemap_url}")
+            async with aclosing(stream_url(session, final_sitemap_url)) as xml_stream: temp_sitemap_urls = await parse_sitemap(xml_stream, collected)
+            if temp_sitemap_urls is None: print(f"[!] Failed fetch/parse: {final_sitemap_url}")
+            elif temp_sitemap_urls:
                  print(f"[*] Index sitemap found. Adding sub-sitemaps."); sitemaps_to_process.extend(temp_sitemap_urls); sitemap_found = True
-            else:
-                 url_data_check = parse_url_sitemap(xml_content)
-                 if url_data_check is not None: print(f"[*] URL sitemap found."); sitemaps_to_process.append(final_sitemap_url); sitemap_found = True
-                 else: print(f"[!] Failed parse: {final_sitemap_url}")
-        else: print(f"[!] Failed fetch: {final_sitemap_url}")
-    else:
-        print(f"[*] Auto-discovering sitemap from: {base_url}")
-        for suffix in SITEMAP_SUFFIXES:
-            sitemap_url = urljoin(base_url, suffix.lstrip('/')); print(f"[*] Attempting: {sitemap_url}")
-            xml_content = fetch_url(session, sitemap_url, is_xml=True)
-            if xml_content:
-                temp_sitemap_urls = parse_sitemap_index(xml_content)
-                if temp_sitemap_urls: print(f"[*] Index found."); sitemaps_to_process.extend(temp_sitemap_urls); sitemap_found = True; break
-                else:
-                    url_data_check = parse_url_sitemap(xml_content)
-                    if url_data_check is not None: print(f"[*] URL sitemap found."); sitemaps_to_process.append(sitemap_url); sitemap_found = True
-                    else: print(f"[*] Found, but failed parse.")
-            else: print(f"[*] Not found/fetch failed."); random_delay()
-        if not sitemap_found and sitemaps_to_process: print("[*] No index, using discovered URL sitemaps."); sitemap_found = True
-
-    if not sitemap_found or not sitemaps_to_process: sys.exit(f"[!] No valid sitemaps found/processed.")
-
-    print(f"\n[*] Processing {len(sitemaps_to_process)} sitemap file(s)...")
-    for sitemap_url in sitemaps_to_process:
-        print(f"--- Processing sitemap: {sitemap_url} ---")
-        xml_content = fetch_url(session, sitemap_url, is_xml=True)
-        if xml_content:
-            url_data = parse_url_sitemap(xml_content)
-            if url_data is not None: all_url_data.extend(url_data)
-            else: print(f"[!] Skipping results from failed parse: {sitemap_url}")
-            random_delay()
-        else: print(f"[!] Failed fetch/parse: {sitemap_url}"); random_delay()
-
-    if not all_url_data: sys.exit("[!] No URLs found in sitemaps.")
-
-    unique_url_data_dict = {url: lastmod for url, lastmod in all_url_data}
-    unique_url_data = list(unique_url_data_dict.items())
-    print(f"\n[*] Found {len(unique_url_data)} unique URLs.")
-
-    filtered_url_data = filter_articles_by_date(unique_url_data, args.since_date)
-    print(f"[*] After date filtering: {len(filtered_url_data)} URLs remain.")
-
-    url_pattern_regex = re.compile(r"/\d{4}/\d{2}(?:/\d{2})?/")
-    final_urls_to_process = []
-    print(f"\n[*] Filtering for domain '{target_domain}' & article pattern...")
-    skipped_pattern_count = 0
-    for url, _ in filtered_url_data:
-        parsed_url = urlparse(url)
-        if parsed_url.netloc == target_domain and url_pattern_regex.search(parsed_url.path): final_urls_to_process.append(url)
-        else: skipped_pattern_count += 1
-    print(f"[*] Domain/Pattern Filter: Kept={len(final_urls_to_process)}, Skipped={skipped_pattern_count}")
-
-    if not final_urls_to_process: sys.exit("[!] No URLs matched all criteria.")
-
-    print(f"\n--- Processing {len(final_urls_to_process)} final articles ---")
-    success_count, fail_count = 0, 0
-    for i, article_url in enumerate(final_urls_to_process):
-        print("-" * 10); print(f"[*] Processing {i+1}/{len(final_urls_to_process)}: {article_url}")
-        html_content = fetch_url(session, article_url)
-        if not html_content: fail_count += 1; random_delay(); continue
-        title, article_date_str, md_content = parse_and_convert_article(html_content, article_url)
-        if not md_content: print(f"[!] Failed convert: {article_url}", file=sys.stderr); fail_count += 1; random_delay(); continue
-        filename = clean_filename(title, article_date_str)
-        if save_markdown(filename, title, article_date_str, md_content, article_url): success_count += 1
-        else: fail_count += 1
-        random_delay()
+            else: print(f"[*] URL sitemap found."); sitemaps_to_process.append(final_sitemap_url); parsed_sitemaps.add(final_sitemap_url); sitemap_found = True
+        else:
+            print(f"[*] Auto-discovering sitemap from: {base_url}")
+            candidate_urls = [urljoin(base_url, suffix.lstrip('/')) for suffix in SITEMAP_SUFFIXES]
+            # Probe all candidates at once (same host, pooled connection), then evaluate them in priority order
+            candidate_contents = await asyncio.gather(*(fetch_url(session, candidate_url, is_xml=True) for candidate_url in candidate_urls))
+            for sitemap_url, xml_content in zip(candidate_urls, candidate_contents):
+                print(f"[*] Attempting: {sitemap_url}")
+                if xml_content:
+                    temp_sitemap_urls = await parse_sitemap(xml_content, collected)
+                    if temp_sitemap_urls is None: print(f"[*] Found, but failed parse.")
+                    elif temp_sitemap_urls: print(f"[*] Index found."); sitemaps_to_process.extend(temp_sitemap_urls); sitemap_found = True; break
+                    else: print(f"[*] URL sitemap found."); sitemaps_to_process.append(sitemap_url); parsed_sitemaps.add(sitemap_url); sitemap_found = True
+                else: print(f"[*] Not found/fetch failed.")
+            if not sitemap_found and sitemaps_to_process: print("[*] No index, using discovered URL sitemaps."); sitemap_found = True
+
+        if not sitemap_found or not sitemaps_to_process: sys.exit(f"[!] No valid sitemaps found/processed.")
+
+        print(f"\n[*] Processing {len(sitemaps_to_process)} sitemap file(s)...")
+        for sitemap_url in sitemaps_to_process:
+            if sitemap_url in parsed_sitemaps: print(f"[*] Already parsed during discovery: {sitemap_url}"); continue
+            print(f"--- Processing sitemap: {sitemap_url} ---")
+            async with aclosing(stream_url(session, sitemap_url)) as xml_stream: nested_sitemap_urls = await parse_sitemap(xml_stream, collected)
+            if nested_sitemap_urls is None: print(f"[!] Failed fetch/parse (entries read before the error are kept): {sitemap_url}")
+            elif nested_sitemap_urls:
+                new_sitemap_urls = [url for url in nested_sitemap_urls if url not in sitemaps_to_process]
+                print(f"[*] Nested index, adding {len(new_sitemap_urls)} sub-sitemaps."); sitemaps_to_process.extend(new_sitemap_urls)
+            await random_delay()
+
+        if not collected: sys.exit("[!] No URLs found in sitemaps.")
+        print(f"\n[*] Found {len(collected)} unique URLs.")
+
+        final_urls_to_process = filter_article_urls(collected.items(), target_domain, args.since_date)
+
+        if not final_urls_to_process: sys.exit("[!] No URLs matched all criteria.")
+
+        print(f"\n--- Processing {len(final_urls_to_process)} final articles ---")
+        success_count, unchanged_count, fail_count = 0, 0, 0
+        total = len(final_urls_to_process)
+        try: os.makedirs(OUTPUT_DIR, exist_ok=True)
+        except OSError as e: sys.exit(f"[!] Cannot create dir {OUTPUT_DIR}: {e}")
+        cache = load_cache()
+        semaphore = asyncio.Semaphore(args.workers)
+        outcomes = await asyncio.gather(*(process_article(session, semaphore, article_url, collected.get(article_url), cache, i + 1, total, args.workers, not args.no_cache)
+                                          for i, article_url in enumerate(final_urls_to_process)), return_exceptions=True)
+        for article_url, outcome in zip(final_urls_to_process, outcomes):
+            if isinstance(outcome, Exception): print(f"[!] Unexpected error processing {article_url}: {outcome}", file=sys.stderr); outcome = 'failed'
+            if outcome == 'saved': success_count += 1
+            elif outcome == 'unchanged': unchanged_count += 1
+            else: fail_count += 1
+    save_cache(cache)
 
     end_time = time.time()
     print("\n" + "=" * 30)
     print("--- Batch Processing Complete ---")
-    print(f"Success: {success_count}, Fail/Skip: {fail_count}, Total: {len(final_urls_to_process)}")
+    print(f"Success: {success_count}, Unchanged: {unchanged_count}, Fail/Skip: {fail_count}, Total: {len(final_urls_to_process)}")
     print(f"Output: {os.path.abspath(OUTPUT_DIR)}")
     print(f"Time: {end_time - start_time:.2f}s")
     print("=" * 30)
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())